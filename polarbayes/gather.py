@@ -1,3 +1,4 @@
+import functools
 from collections.abc import Sequence
 from typing import Iterable
 
@@ -7,7 +8,7 @@ import polars as pl
 import polars.selectors as cs
 from polars._typing import ColumnNameOrSelector
 
-from polarbayes.spread import spread_draws_and_get_index_cols
+from polarbayes.spread import _extract, _index_columns, _value_names
 
 
 def _assert_not_in_index_columns(
@@ -46,6 +47,76 @@ def _assert_not_in_index_columns(
     return None
 
 
+def _is_plain_column_name(item: ColumnNameOrSelector) -> bool:
+    """
+    Check whether an index item is a string naming a single
+    column, rather than a regular expression or wildcard that
+    polars would expand.
+
+    Parameters
+    ----------
+    item
+        Column name, selector, or expression.
+
+    Returns
+    -------
+    bool
+        Whether `item` is a plain column name.
+    """
+    return (
+        isinstance(item, str)
+        and item != "*"
+        and not (item.startswith("^") and item.endswith("$"))
+    )
+
+
+def _expand_index_names(
+    data: pl.LazyFrame | pl.DataFrame,
+    index: ColumnNameOrSelector | Sequence[ColumnNameOrSelector],
+) -> list[str]:
+    """
+    Resolve index column names, selectors, and/or expressions
+    to the names of the columns they select.
+
+    Plain column names and selectors are resolved against the
+    schema alone, without building a query plan. Anything else,
+    such as a regular expression or `pl.col(...)` expression, is
+    resolved by selecting it from `data`.
+
+    Parameters
+    ----------
+    data
+        Data frame the index columns belong to.
+    index
+        Column name, selector, or expression, or sequence of
+        column names, selectors, and/or expressions.
+
+    Returns
+    -------
+    list[str]
+        Names of the selected index columns.
+    """
+    items = [index] if isinstance(index, (str, pl.Expr)) else list(index)
+    if not all(
+        _is_plain_column_name(item) or cs.is_selector(item) for item in items
+    ):
+        return data.lazy().select(index).collect_schema().names()
+    schema = (
+        data.collect_schema()
+        if isinstance(data, pl.LazyFrame)
+        else data.schema
+    )
+    return [
+        name
+        for item in items
+        for name in (
+            [item]
+            if isinstance(item, str)
+            else cs.expand_selector(schema, item)
+        )
+    ]
+
+
 def gather_variables(
     data: pl.LazyFrame | pl.DataFrame,
     index: ColumnNameOrSelector | Sequence[ColumnNameOrSelector] | None = None,
@@ -89,7 +160,7 @@ def gather_variables(
     if index is None:
         index = cs.by_name("chain", "draw", require_all=False)
 
-    index_names = data.select(index).collect_schema().names()
+    index_names = _expand_index_names(data, index)
 
     # more informative error message than `unpivot()` gives on its own
     [
@@ -99,8 +170,12 @@ def gather_variables(
         ).items()
     ]
 
+    # pass the resolved names, since eager `unpivot()` does not
+    # accept expressions or regular expressions as its index
     return data.unpivot(
-        index=index, variable_name=variable_name, value_name=value_name
+        index=index_names,
+        variable_name=variable_name,
+        value_name=value_name,
     )
 
 
@@ -114,6 +189,7 @@ def gather_draws(
     rng: bool | int | np.random.Generator = None,
     value_name: str = "value",
     variable_name: str = "variable",
+    rechunk: bool = False,
 ) -> pl.DataFrame:
     """
     Convert an ArviZ InferenceData object to a polars
@@ -149,6 +225,11 @@ def gather_draws(
     variable_name
         Name for the variable column in the output DataFrame. Default `"variable"`.
 
+    rechunk
+        Whether to rechunk the output DataFrame into contiguous
+        memory. Default `False`, which avoids copying every
+        variable's draws into a single chunk.
+
     Returns
     -------
     pl.DataFrame
@@ -157,37 +238,51 @@ def gather_draws(
         (typically `"chain"` and "draw"`), a column of variable
         names, a column of associated variable values,
         plus (as needed) columns that index array-valued variables.
+        Non-index coordinates are gathered along with the data
+        variables, just as `spread_draws` gives them columns.
+        Index column dtypes are as described for
+        `spread_draws_and_get_index_cols`.
     """
     # need to extract all variables jointly to ensure same
     # draws for each
-    extracted = az.extract(
+    extracted = _extract(
         data,
         group=group,
         combined=combined,
         var_names=var_names,
         filter_vars=filter_vars,
         num_samples=num_samples,
-        keep_dataset=True,
         rng=rng,
     )
-    var_names = extracted.data_vars.keys()
-    return pl.concat(
+
+    # variables commonly share dimensions (e.g. every scalar
+    # variable has only the sample dimensions), so expand
+    # the index columns for a given set of dimensions once
+    # and reuse them for each variable.
+    @functools.cache
+    def _index_frame(dims: tuple[str, ...]) -> pl.DataFrame:
+        index_frame = pl.DataFrame(
+            _index_columns(extracted, dims), nan_to_null=True
+        )
         [
-            gather_variables(
-                *spread_draws_and_get_index_cols(
-                    extracted,
-                    group=group,
-                    var_names=var,
-                    combined=False,
-                    filter_vars=None,
-                    num_samples=None,
-                    rng=False,
-                    enforce_drop_chain_draw=combined,
-                ),
-                variable_name="variable",
-                value_name="value",
-            )
-            for var in var_names
-        ],
-        how="diagonal",
-    )
+            _assert_not_in_index_columns(k, v, index_frame.columns)
+            for k, v in dict(
+                value_name=value_name, variable_name=variable_name
+            ).items()
+        ]
+        return index_frame
+
+    def _gather_var(name: str) -> pl.DataFrame:
+        # build each variable's long-form frame directly from
+        # its array, so no wide (spread) frame is ever created.
+        var = extracted[name]
+        return _index_frame(var.dims).with_columns(
+            pl.lit(name).alias(variable_name),
+            # treat NaN draws as missing (null)
+            pl.Series(value_name, var.values.reshape(-1), nan_to_null=True),
+        )
+
+    # gather the same variables that `spread_draws` gives value
+    # columns, including non-index coordinates
+    frames = [_gather_var(name) for name in _value_names(extracted)]
+    return pl.concat(frames, how="diagonal", rechunk=rechunk)
@@ -1,12 +1,392 @@
+import math
+import re
+import warnings
+from collections.abc import Sequence
 from typing import Iterable
 
 import arviz as az
 import numpy as np
 import pandas as pd
 import polars as pl
+import xarray as xr
 
 
-def spread_draws_to_pandas_(
+def _narrow_int_index(
+    values: np.ndarray, min_dtype: type[np.signedinteger] = np.int16
+) -> np.ndarray:
+    """
+    Cast integer index values to the narrowest signed integer
+    dtype, no narrower than `min_dtype`, that can hold them.
+
+    Parameters
+    ----------
+    values
+        1-D array of index values.
+
+    min_dtype
+        Narrowest dtype to cast to. Default `np.int16`.
+
+    Returns
+    -------
+    np.ndarray
+        `values` cast to `np.int16` or `np.int32`, or left as
+        is if they are not signed integers or no narrower dtype
+        can hold them.
+    """
+    if values.dtype.kind != "i" or values.size == 0:
+        return values
+    lo, hi = values.min(), values.max()
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if (
+            info.bits >= np.iinfo(min_dtype).bits
+            and info.bits < values.dtype.itemsize * 8
+            and info.min <= lo
+            and hi <= info.max
+        ):
+            return values.astype(dtype)
+    return values
+
+
+def _is_positional_index(dataset: xr.Dataset, dim: str) -> bool:
+    """
+    Check whether a dimension of an xarray Dataset is indexed
+    by position only, rather than by user-supplied coordinates.
+
+    Parameters
+    ----------
+    dataset
+        Dataset the dimension belongs to.
+
+    dim
+        Name of the dimension.
+
+    Returns
+    -------
+    bool
+        Whether `dim` has no coordinate values, or has one of
+        the default `<variable>_dim_<n>` names that ArviZ gives
+        dimensions that it indexes by position.
+    """
+    return (
+        dim not in dataset.indexes
+        or re.fullmatch(r".+_dim_\d+", dim) is not None
+    )
+
+
+def _expand_index(
+    values: np.ndarray, n_outer: int, n_inner: int
+) -> np.ndarray | pl.Series:
+    """
+    Expand the values of a single index into a flat column
+    of a Cartesian product, repeating each value `n_inner`
+    times in a row and the whole repeated sequence `n_outer`
+    times.
+
+    Parameters
+    ----------
+    values
+        1-D array of index values.
+
+    n_outer
+        Product of the sizes of the dimensions that vary
+        more slowly than this index.
+
+    n_inner
+        Product of the sizes of the dimensions that vary
+        more quickly than this index.
+
+    Returns
+    -------
+    np.ndarray | pl.Series
+        Column of length `n_outer * values.size * n_inner`.
+        Non-numeric (object) index values, such as string
+        coordinates, are returned as a polars Series built by
+        gathering from the index values, which avoids
+        converting a long column of Python objects to polars.
+    """
+    if values.dtype == object:
+        return pl.Series(values).gather(
+            _expand_index(np.arange(values.size), n_outer, n_inner)
+        )
+    # single pass write of the broadcast view, with no
+    # intermediate array as in np.tile(np.repeat(...))
+    return np.broadcast_to(
+        values[np.newaxis, :, np.newaxis], (n_outer, values.size, n_inner)
+    ).reshape(-1)
+
+
+def _index_columns(
+    dataset: xr.Dataset, dims: Sequence[str]
+) -> dict[str, np.ndarray | pl.Series]:
+    """
+    Expand the indices of an xarray Dataset into flat columns
+    enumerating the Cartesian product of those indices, without
+    materializing a Pandas MultiIndex.
+
+    Parameters
+    ----------
+    dataset
+        Dataset whose indices to expand.
+
+    dims
+        Dimensions to include in the product, in order. The last
+        dimension varies fastest, matching the C-order layout of
+        arrays transposed to `dims`.
+
+    Returns
+    -------
+    dict[str, np.ndarray | pl.Series]
+        Dictionary mapping index column names to columns of
+        length equal to the product of the dimension sizes.
+        Stacked (MultiIndex) dimensions, such as the `"sample"`
+        dimension created by `az.extract` with `combined=True`,
+        contribute one column per level (typically `"chain"`
+        and `"draw"`) rather than a column for the dimension itself.
+        The `"chain"` and `"draw"` columns are narrowed to 32-bit
+        integers, and positional index columns (see
+        `_is_positional_index`) to the narrowest signed integer
+        dtype that holds them, but no narrower than 16 bits.
+    """
+    sizes = [dataset.sizes[dim] for dim in dims]
+    columns = {}
+    for i_dim, dim in enumerate(dims):
+        n_outer = math.prod(sizes[:i_dim])
+        n_inner = math.prod(sizes[i_dim + 1 :])
+        index = dataset.get_index(dim)
+        if isinstance(index, pd.MultiIndex):
+            levels = {
+                name: index.get_level_values(name).to_numpy()
+                for name in index.names
+            }
+        else:
+            levels = {dim: index.to_numpy()}
+        for name, values in levels.items():
+            # narrow before expanding, so the long column is
+            # written at the narrow width
+            if name in ("chain", "draw"):
+                values = _narrow_int_index(values, np.int32)
+            elif _is_positional_index(dataset, dim):
+                values = _narrow_int_index(values)
+            columns[name] = _expand_index(values, n_outer, n_inner)
+    return columns
+
+
+def _value_names(dataset: xr.Dataset) -> list[str]:
+    """
+    Get the names of the variables of an xarray Dataset that
+    hold values, in the order `xr.Dataset.to_dataframe` gives
+    them columns.
+
+    Parameters
+    ----------
+    dataset
+        Dataset whose value variables to name.
+
+    Returns
+    -------
+    list[str]
+        Names of the Dataset's data variables and non-index
+        coordinates. Index levels of stacked dimensions (e.g.
+        `"chain"` and `"draw"` when `combined=True`) are also
+        coordinate variables of the Dataset, but they belong in
+        the index columns only.
+        See https://github.com/pydata/xarray/issues/10538
+    """
+    return [
+        name
+        for name in dataset.variables
+        if name not in dataset.dims and name not in dataset.indexes
+    ]
+
+
+def _single_var_to_polars(
+    dataset: xr.Dataset, var_name: str
+) -> tuple[pl.DataFrame, tuple]:
+    """
+    Convert a single variable of an xarray Dataset to a polars
+    DataFrame of tidy (spread) draws directly from its array.
+
+    Parameters
+    ----------
+    dataset
+        Dataset containing the variable.
+
+    var_name
+        Name of the variable to convert.
+
+    Returns
+    -------
+    tuple[pl.DataFrame, tuple]
+        Two-entry tuple whose first entry is a polars DataFrame
+        with index columns for the variable's dimensions followed
+        by a column of the variable's values, and whose second
+        entry is a tuple giving the names of the index columns.
+    """
+    var = dataset[var_name]
+    index_cols = _index_columns(dataset, var.dims)
+    values = np.ascontiguousarray(var.values).reshape(-1)
+    return (
+        pl.DataFrame(index_cols | {var_name: values}, nan_to_null=True),
+        tuple(index_cols),
+    )
+
+
+def _combine_unstacked(dataset: xr.Dataset) -> xr.Dataset | None:
+    """
+    Combine the chain and draw dimensions of a Dataset the way
+    `az.extract` does with `combined=True`, but without stacking
+    them into a single `"sample"` dimension.
+
+    Each variable has its `"chain"` and `"draw"` dimensions moved
+    last, where `Dataset.stack` would put the stacked dimension,
+    and the dataset's dimension order matches that of the stacked
+    Dataset with `"sample"` replaced by `"chain"`, `"draw"`. Both
+    therefore convert to the same rows and columns, but this skips
+    building the stacked MultiIndex, which dominates the cost of
+    `az.extract` on small data.
+
+    Parameters
+    ----------
+    dataset
+        Dataset to combine.
+
+    Returns
+    -------
+    xr.Dataset | None
+        The combined Dataset, or `None` if `dataset` lacks indexed
+        `"chain"` and `"draw"` dimensions, or has variables with
+        only one of them, in which case it must be stacked.
+    """
+    chain_draw = {"chain", "draw"}
+    if not chain_draw.issubset(dataset.indexes) or any(
+        0 < len(chain_draw.intersection(var.dims)) < 2
+        for name, var in dataset.variables.items()
+        if name not in chain_draw
+    ):
+        return None
+    # dropping and re-adding the chain and draw coordinates makes
+    # the dataset's dimension order follow the transposed variables
+    return (
+        dataset.drop_vars(["chain", "draw"])
+        .transpose(..., "chain", "draw")
+        .assign_coords(chain=dataset["chain"], draw=dataset["draw"])
+    )
+
+
+def _extract(
+    data: az.InferenceData,
+    group: str = "posterior",
+    combined: bool = True,
+    var_names: Iterable[str] = None,
+    filter_vars: str = None,
+    num_samples: int = None,
+    rng: bool | int | np.random.Generator = None,
+) -> xr.Dataset:
+    """
+    Equivalent of `az.extract` with `keep_dataset=True` that,
+    when downsampling, selects the requested samples before
+    stacking rather than stacking and permuting every sample.
+
+    Parameters
+    ----------
+    data
+        Data to extract from.
+
+    group
+        `group` parameter passed to `az.extract`.
+
+    combined
+        `combined` parameter passed to `az.extract`.
+
+    var_names
+        `var_names` parameter passed to `az.extract`.
+
+    filter_vars
+        `filter_vars` parameter passed to `az.extract`.
+
+    num_samples
+        `num_samples` parameter passed to `az.extract`.
+
+    rng
+        `rng` parameter passed to `az.extract`.
+
+    Returns
+    -------
+    xr.Dataset
+        The extracted Dataset, identical to the output of
+        `az.extract` for the same arguments (and, when `rng` is
+        a seed or `np.random.Generator`, the same random state),
+        except that in the default case (combined, with no
+        subsetting or downsampling) the chain and draw dimensions
+        may be left unstacked, per `_combine_unstacked`.
+    """
+    if (
+        combined
+        and num_samples is None
+        and (rng is None or rng is False)
+        and var_names is None
+        and filter_vars is None
+        and isinstance(data, az.InferenceData)
+        and group in data.groups()
+    ):
+        combined_unstacked = _combine_unstacked(data[group])
+        if combined_unstacked is not None:
+            return combined_unstacked
+    if not combined or num_samples is None:
+        return az.extract(
+            data,
+            group=group,
+            combined=combined,
+            var_names=var_names,
+            filter_vars=filter_vars,
+            num_samples=num_samples,
+            keep_dataset=True,
+            rng=rng,
+        )
+    dataset = az.extract(
+        data,
+        group=group,
+        combined=False,
+        var_names=var_names,
+        filter_vars=filter_vars,
+        keep_dataset=True,
+    )
+    n_draw = dataset.sizes["draw"]
+    n_sample = dataset.sizes["chain"] * n_draw
+    # draw the same subset of (chain, draw) pairs, in the same
+    # order, as az.extract's permute-then-truncate, but only
+    # index the selected samples out of each variable.
+    if rng is False:
+        subset = np.arange(min(num_samples, n_sample))
+    else:
+        # check for the booleans by identity, as az.extract does,
+        # since 0 and 1 are valid seeds
+        rng = np.random.default_rng(
+            None if rng is None or rng is True else rng
+        )
+        subset = rng.permutation(np.arange(n_sample))[:num_samples]
+    selected = dataset.isel(
+        chain=xr.DataArray(subset // n_draw, dims="sample"),
+        draw=xr.DataArray(subset % n_draw, dims="sample"),
+    )
+    sample_index = pd.MultiIndex.from_arrays(
+        [selected["chain"].values, selected["draw"].values],
+        names=["chain", "draw"],
+    )
+    # dropping and re-adding the sample coordinates after moving
+    # "sample" last makes the dataset's dimension order follow the
+    # transposed variables, as it does after Dataset.stack
+    return (
+        selected.drop_vars(["chain", "draw"])
+        .transpose(..., "sample")
+        .assign_coords(
+            xr.Coordinates.from_pandas_multiindex(sample_index, "sample")
+        )
+    )
+
+
+def spread_draws_to_polars_(
     data: az.InferenceData,
     group: str = "posterior",
     combined: bool = True,
@@ -14,11 +394,11 @@ def spread_draws_to_pandas_(
     filter_vars: str = None,
     num_samples: int = None,
     rng: bool | int | np.random.Generator = None,
-) -> pd.DataFrame:
+) -> tuple[pl.DataFrame, tuple]:
     """
-    Convert an ArviZ InferenceData object group to a Pandas
+    Convert an ArviZ InferenceData object group to a polars
     DataFrame of tidy (spread) draws, using the syntax of
-    arviz.extract
+    arviz.extract, without an intermediate Pandas DataFrame.
 
     Parameters
     ----------
@@ -45,36 +425,48 @@ def spread_draws_to_pandas_(
 
     Returns
     -------
-    pd.DataFrame
-       Pandas DataFrame with a MultiIndex on the chain id,
-       draw id, and any additional indices determined by
-       the dimensions of the variables selected via
-       `var_names` or `filter_vars`, with columns containing
-       the associated values of those variables.
-    """
-    df = az.extract(
+    tuple[pl.DataFrame, tuple]
+       Two-entry tuple whose first entry is a polars DataFrame
+       with index columns for the chain id, draw id, and any
+       additional indices determined by the dimensions of the
+       variables selected via `var_names` or `filter_vars`,
+       followed by columns containing the associated values of
+       those variables, and whose second entry is a tuple giving
+       the names of the index columns.
+    """
+    extracted = _extract(
         data,
         group=group,
         combined=combined,
         var_names=var_names,
         filter_vars=filter_vars,
         num_samples=num_samples,
-        keep_dataset=True,
         rng=rng,
-    ).to_dataframe()
-    if combined:
-        df = df.drop(["chain", "draw"], axis=1)
-        # az.extract with combined=True assumes that the InferenceData
-        # object has "chain" and "draw" named dimensions and errors otherwise.
-        # When the resultant dataset is converted to a pandas dataframe
-        # via .to_dataframe(), "chain" and "draw" are included _both_
-        # as column names and as Pandas MultiIndex names.
-        # See https://github.com/pydata/xarray/issues/10538
-        #
-        # We only want/need chain and draw in the MultiIndex,
-        # so we drop the columns, which are guaranteed to exist
-        # per by the az.extract assumption mentioned above.
-    return df
+    )
+    value_names = _value_names(extracted)
+    if len(value_names) == 1:
+        (var_name,) = value_names
+        if extracted[var_name].dims == tuple(extracted.sizes):
+            # nothing to broadcast against or transpose, so read
+            # the variable's array as is
+            return _single_var_to_polars(extracted, var_name)
+
+    # same row layout as xr.Dataset.to_dataframe(): the Cartesian
+    # product of all the dataset's dimensions, in dataset order,
+    # with every variable broadcast against that product.
+    dims = list(extracted.sizes)
+    index_cols = _index_columns(extracted, dims)
+    value_cols = {
+        name: extracted.variables[name]
+        .set_dims(extracted.sizes)
+        .values.reshape(-1)
+        for name in value_names
+    }
+    # treat NaN draws as missing (null)
+    return (
+        pl.DataFrame(index_cols | value_cols, nan_to_null=True),
+        tuple(index_cols),
+    )
 
 
 def spread_draws_and_get_index_cols(
@@ -85,7 +477,7 @@ def spread_draws_and_get_index_cols(
     filter_vars: str = None,
     num_samples: int = None,
     rng: bool | int | np.random.Generator = None,
-    enforce_drop_chain_draw: bool = False,
+    enforce_drop_chain_draw: bool = None,
 ) -> tuple[pl.DataFrame, tuple]:
     """
     Convert an ArviZ InferenceData object to a polars
@@ -116,6 +508,11 @@ def spread_draws_and_get_index_cols(
     rng
         `rng` parameter passed to `az.extract`.
 
+    enforce_drop_chain_draw
+        Deprecated and ignored. Already-combined input, such as
+        the output of `az.extract` with `combined=True`, never
+        yields duplicate `"chain"` and `"draw"` value columns.
+
     Returns
     -------
     tuple[pl.DataFrame, tuple]
@@ -127,9 +524,23 @@ def spread_draws_and_get_index_cols(
         include standard columns to identify a unique
         sample (typically `"chain"` and "draw"`) plus (as needed)
         columns that index array-valued variables.
+        `"chain"` and `"draw"` index columns are `pl.Int32`.
+        Positional index columns, for dimensions without
+        coordinates or with ArviZ's default names (such as
+        `"theta_dim_0"`), are `pl.Int16`, or `pl.Int32` for
+        dimensions longer than 32767, so results with such long
+        dimensions may need a cast before being concatenated
+        with others. Other index columns keep the dtypes of
+        their coordinates.
     """
-
-    df = spread_draws_to_pandas_(
+    if enforce_drop_chain_draw is not None:
+        warnings.warn(
+            "`enforce_drop_chain_draw` is deprecated and has no effect. "
+            "Chain and draw are always returned as index columns only.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+    return spread_draws_to_polars_(
         data,
         group=group,
         combined=combined,
@@ -138,13 +549,6 @@ def spread_draws_and_get_index_cols(
         num_samples=num_samples,
         rng=rng,
     )
-    if enforce_drop_chain_draw:
-        df = df.drop(["chain", "draw"], axis=1)
-        # this is handled automatically when `combined=True`
-        # by spread_draws_to_pandas_,
-        # but not when combined=False but the `data` input
-        # is an already-combined output of `az.extract`.
-    return (pl.DataFrame(df.reset_index()), tuple(df.index.names))
 
 
 def spread_draws(
@@ -193,6 +597,8 @@ def spread_draws(
         include standard columns to identify a unique
         sample (typically `"chain"` and "draw"`) plus (as needed)
         columns that index array-valued variables.
+        Index column dtypes are as described for
+        `spread_draws_and_get_index_cols`.
     """
     result, _ = spread_draws_and_get_index_cols(
         data,
@@ -0,0 +1,162 @@
+import arviz as az
+import numpy as np
+import polars as pl
+import polars.selectors as cs
+import pytest
+
+import polarbayes as pb
+
+
+def test_gather_draws_nan_to_null():
+    """
+    NaN draws should be treated as missing and come out
+    as nulls.
+    """
+    rng = np.random.default_rng(5)
+    a = rng.normal(size=(2, 10))
+    b = rng.normal(size=(2, 10, 3))
+    a[0, 3] = np.nan
+    b[1, 2, :] = np.nan
+    idata = az.from_dict(posterior={"a": a, "b": b})
+
+    result = pb.gather_draws(idata)
+    assert result["value"].null_count() == 4
+    assert not result["value"].is_nan().any()
+
+
+def test_gather_draws_value_and_variable_names():
+    """
+    Custom value and variable column names should be used
+    in the output.
+    """
+    idata = az.from_dict(
+        posterior={"a": np.zeros((2, 3)), "b": np.ones((2, 3, 2))}
+    )
+    result = pb.gather_draws(
+        idata, value_name="draw_value", variable_name="par"
+    )
+    assert result.columns == ["chain", "draw", "par", "draw_value", "b_dim_0"]
+    assert result["par"].unique(maintain_order=True).to_list() == ["a", "b"]
+    assert result["draw_value"].sum() == 12
+
+
+@pytest.mark.parametrize(
+    "kwargs, arg_name",
+    [
+        (dict(value_name="chain"), "value_name"),
+        (dict(variable_name="draw"), "variable_name"),
+        (dict(value_name="b_dim_0"), "value_name"),
+    ],
+)
+def test_gather_draws_name_clash(kwargs, arg_name):
+    """
+    Value or variable names that clash with an index column
+    should raise an informative error.
+    """
+    idata = az.from_dict(
+        posterior={"a": np.zeros((2, 3)), "b": np.ones((2, 3, 2))}
+    )
+    with pytest.raises(ValueError, match=f"Specified {arg_name}="):
+        pb.gather_draws(idata, **kwargs)
+
+
+def test_gather_draws_includes_non_index_coords():
+    """
+    Non-index coordinates should be gathered once each, like
+    data variables, so gather_draws and spread_draws agree.
+    """
+    rng = np.random.default_rng(5)
+    idata = az.from_dict(
+        posterior={
+            "th": rng.normal(size=(2, 3)),
+            "mu": rng.normal(size=(2, 3)),
+        }
+    )
+    idata.posterior = idata.posterior.assign_coords(
+        lp=(("chain", "draw"), rng.normal(size=(2, 3)))
+    )
+
+    for kwargs in [dict(), dict(combined=False), dict(num_samples=4, rng=1)]:
+        result = pb.gather_draws(idata, **kwargs)
+        spread = pb.spread_draws(idata, **kwargs)
+        assert result["variable"].unique(maintain_order=True).to_list() == [
+            "th",
+            "mu",
+            "lp",
+        ]
+        assert result.height == 3 * spread.height
+        assert (
+            result.filter(variable="lp")["value"].to_list()
+            == spread["lp"].to_list()
+        )
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize(
+    "index",
+    [
+        None,
+        ["chain", "draw"],
+        cs.by_name("chain", "draw"),
+        [cs.by_name("chain"), "draw"],
+        [pl.col("chain"), pl.col("draw")],
+        [pl.col("chain"), cs.by_name("draw")],
+        "^(chain|draw)$",
+    ],
+)
+def test_gather_variables_index(index, lazy):
+    """
+    Index columns can be given as names, selectors, expressions,
+    or regular expressions, on eager or lazy frames.
+    """
+    df = pl.DataFrame(
+        {"chain": [0, 0, 1], "draw": [0, 1, 0], "a": [1.0, 2.0, 3.0]}
+    ).with_columns(b=pl.col("a") * 2)
+    data = df.lazy() if lazy else df
+    result = pb.gather_variables(data, index=index)
+    if lazy:
+        result = result.collect()
+    assert result.columns == ["chain", "draw", "variable", "value"]
+    assert result.height == 6
+
+
+def test_gather_variables_single_expression_index():
+    """
+    A single expression is accepted as the index.
+    """
+    lf = pl.LazyFrame({"chain": [0, 1], "a": [1.0, 2.0]})
+    result = pb.gather_variables(lf, index=pl.col("chain")).collect()
+    assert result.columns == ["chain", "variable", "value"]
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        ["chain", "value"],
+        cs.by_name("chain", "value"),
+        [pl.col("chain"), pl.col("value")],
+        "^(chain|value)$",
+    ],
+)
+def test_gather_variables_index_name_clash(index):
+    """
+    An index column named like the output value column should
+    raise an informative error, however the index is given.
+    """
+    df = pl.DataFrame({"chain": [0, 1], "value": [1, 2], "a": [1.0, 2.0]})
+    with pytest.raises(ValueError, match="value_name='value'"):
+        pb.gather_variables(df, index=index)
+    with pytest.raises(ValueError, match="value_name='value'"):
+        pb.gather_variables(df.lazy(), index=index)
+
+
+def test_gather_draws_rechunk():
+    """
+    Output should be left in one chunk per variable by
+    default, and in a single chunk with rechunk=True.
+    """
+    idata = az.from_dict(
+        posterior={"a": np.zeros((2, 3)), "b": np.ones((2, 3, 2))}
+    )
+    assert pb.gather_draws(idata).n_chunks() == 2
+    assert pb.gather_draws(idata, rechunk=True).n_chunks() == 1
@@ -0,0 +1,222 @@
+"""
+Check spread_draws and gather_draws against a reference
+implementation that goes through az.extract(...).to_dataframe(),
+as polarbayes originally did.
+"""
+
+import arviz as az
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+import xarray as xr
+from polars.testing import assert_frame_equal
+
+import polarbayes as pb
+
+
+def reference_spread_draws(
+    data, group="posterior", combined=True, **extract_kwargs
+) -> tuple[pl.DataFrame, tuple]:
+    df = az.extract(
+        data,
+        group=group,
+        combined=combined,
+        keep_dataset=True,
+        **extract_kwargs,
+    ).to_dataframe()
+    # drop the duplicate chain / draw value columns created by
+    # to_dataframe() for a stacked sample dimension, when present
+    df = df.drop(["chain", "draw"], axis=1, errors="ignore")
+    return pl.DataFrame(df.reset_index()), tuple(df.index.names)
+
+
+def reference_gather_draws(
+    data, group="posterior", combined=True, **extract_kwargs
+) -> pl.DataFrame:
+    extracted = az.extract(
+        data,
+        group=group,
+        combined=combined,
+        keep_dataset=True,
+        **extract_kwargs,
+    )
+    frames = []
+    for var in extracted.data_vars:
+        df, index_cols = reference_spread_draws(
+            extracted, var_names=var, combined=False, rng=False
+        )
+        frames.append(
+            df.unpivot(
+                index=list(index_cols),
+                variable_name="variable",
+                value_name="value",
+            )
+        )
+    return pl.concat(frames, how="diagonal")
+
+
+@pytest.fixture
+def idata() -> az.InferenceData:
+    rng = np.random.default_rng(20)
+    n_chain, n_draw = 3, 7
+    schools = ["Choate", "Deerfield", "Phillips Andover"]
+    times = pd.date_range("2020-01-01", periods=2, freq="D").to_numpy()
+    posterior = {
+        "mu": rng.normal(size=(n_chain, n_draw)),
+        "theta": rng.normal(size=(n_chain, n_draw, len(schools))),
+        "trend": rng.normal(size=(n_chain, n_draw, len(times))),
+        "effect": rng.normal(size=(n_chain, n_draw, 3)),
+        "matrix": rng.normal(size=(n_chain, n_draw, 2, 2)),
+    }
+    posterior["mu"][1, 2] = np.nan
+    posterior["theta"][0, 4, 1] = np.nan
+    posterior["matrix"][2, 6, :, 0] = np.nan
+    idata = az.from_dict(
+        posterior=posterior,
+        observed_data={"y": rng.normal(size=len(schools))},
+        coords={
+            "school": schools,
+            "time": times,
+            "k": [10, 20, 40000],
+        },
+        dims={
+            "theta": ["school"],
+            "trend": ["time"],
+            "effect": ["k"],
+            "y": ["school"],
+        },
+    )
+    # a posterior variable without the sample dimensions
+    idata.posterior["scale"] = ("k", np.array([1.0, np.nan, 3.0]))
+    return idata
+
+
+_extract_cases = [
+    dict(),
+    dict(combined=False),
+    dict(var_names="theta"),
+    dict(var_names="theta", combined=False),
+    dict(var_names=["mu", "effect"]),
+    dict(var_names=["~mu"]),
+    dict(var_names="matrix"),
+    dict(var_names=["scale", "trend"]),
+    dict(filter_vars="like", var_names="t"),
+    dict(num_samples=5, rng=1),
+    dict(num_samples=5, rng=0),
+    dict(num_samples=5, rng="generator"),
+    dict(num_samples=5, rng=False),
+    dict(num_samples=100, rng=3),
+    dict(num_samples=4, rng=1, var_names=["theta", "mu"]),
+    dict(rng=2),
+    dict(group="observed_data", combined=False),
+]
+
+
+def _resolve(kwargs: dict) -> dict:
+    """
+    Give each call its own, identically seeded Generator.
+    """
+    if kwargs.get("rng") == "generator":
+        return kwargs | dict(rng=np.random.default_rng(11))
+    return kwargs
+
+
+def _assert_index_dtypes(df: pl.DataFrame, index_cols: tuple) -> None:
+    """
+    Integer index columns are narrowed, so check their
+    dtypes separately from the values.
+    """
+    for name in index_cols:
+        if df.schema[name].is_integer():
+            assert df.schema[name] in (pl.Int16, pl.Int32, pl.Int64)
+
+
+@pytest.mark.parametrize("kwargs", _extract_cases)
+def test_spread_draws_matches_reference(idata, kwargs):
+    expected, expected_index_cols = reference_spread_draws(
+        idata, **_resolve(kwargs)
+    )
+    result, index_cols = pb.spread_draws_and_get_index_cols(
+        idata, **_resolve(kwargs)
+    )
+    assert index_cols == expected_index_cols
+    assert_frame_equal(result, expected, check_dtypes=False)
+    _assert_index_dtypes(result, index_cols)
+    assert_frame_equal(pb.spread_draws(idata, **_resolve(kwargs)), result)
+
+
+@pytest.mark.parametrize("kwargs", _extract_cases)
+def test_gather_draws_matches_reference(idata, kwargs):
+    expected = reference_gather_draws(idata, **_resolve(kwargs))
+    result = pb.gather_draws(idata, **_resolve(kwargs))
+    assert_frame_equal(result, expected, check_dtypes=False)
+    assert result.schema["value"] == pl.Float64
+    assert result.schema["variable"] == pl.String
+
+
+def test_coordinate_dtypes(idata):
+    """
+    String, datetime, and integer coordinates keep their types,
+    while chain, draw, and positional indices are narrowed.
+    """
+    result = pb.spread_draws(idata)
+    assert result.schema["school"] == pl.String
+    assert result.schema["time"] == pl.Datetime("ns")
+    assert result.schema["k"] == pl.Int64
+    assert result.schema["chain"] == pl.Int32
+    assert result.schema["draw"] == pl.Int32
+    assert result.schema["matrix_dim_0"] == pl.Int16
+
+    # dimensions without coordinates are positional too
+    dataset = xr.Dataset(
+        {"z": (("chain", "draw", "m"), np.zeros((2, 3, 40000)))},
+        coords={"chain": [0, 1], "draw": [0, 1, 2]},
+    )
+    result = pb.spread_draws(dataset, combined=False)
+    assert result.schema["m"] == pl.Int32
+    assert result["m"].max() == 39999
+
+
+def test_only_unsampled_variables_raise_like_reference(idata):
+    """
+    Selecting only variables without sample dimensions cannot be
+    combined, and fails as it does in az.extract.
+    """
+    with pytest.raises(KeyError):
+        reference_spread_draws(idata, var_names="scale")
+    with pytest.raises(KeyError):
+        pb.spread_draws(idata, var_names="scale")
+    with pytest.raises(KeyError):
+        pb.gather_draws(idata, var_names="scale")
+    assert_frame_equal(
+        pb.spread_draws(idata, var_names="scale", combined=False),
+        reference_spread_draws(idata, var_names="scale", combined=False)[0],
+        check_dtypes=False,
+    )
+
+
+def test_spread_draws_single_variable_uses_dataset_dim_order():
+    """
+    A lone variable whose dimensions are ordered differently
+    from the dataset's should still be laid out in dataset
+    order, as to_dataframe() does.
+    """
+    dataset = xr.Dataset(
+        coords={"chain": [0, 1], "draw": [0, 1, 2], "x": ["u", "v"]}
+    ).assign(z=(("x", "chain", "draw"), np.arange(12.0).reshape(2, 2, 3)))
+    assert tuple(dataset.sizes) == ("chain", "draw", "x")
+
+    expected, expected_index_cols = reference_spread_draws(
+        dataset, combined=False
+    )
+    result, index_cols = pb.spread_draws_and_get_index_cols(
+        dataset, combined=False
+    )
+    assert index_cols == expected_index_cols == ("chain", "draw", "x")
+    assert_frame_equal(result, expected, check_dtypes=False)
+    assert_frame_equal(
+        pb.gather_draws(dataset, combined=False),
+        reference_gather_draws(dataset, combined=False),
+        check_dtypes=False,
+    )
@@ -0,0 +1,123 @@
+import itertools
+
+import arviz as az
+import numpy as np
+import pytest
+import xarray as xr
+
+import polarbayes as pb
+from polarbayes.spread import _extract
+
+
+def test_spread_draws_nan_to_null():
+    """
+    NaN draws should be treated as missing and come out
+    as nulls.
+    """
+    rng = np.random.default_rng(5)
+    a = rng.normal(size=(2, 10))
+    b = rng.normal(size=(2, 10, 3))
+    a[0, 3] = np.nan
+    b[1, 2, :] = np.nan
+    idata = az.from_dict(posterior={"a": a, "b": b})
+
+    # broadcast (multi-variable) path
+    result = pb.spread_draws(idata)
+    assert result["a"].null_count() == 3
+    assert result["b"].null_count() == 3
+    assert not result["a"].is_nan().any()
+    assert not result["b"].is_nan().any()
+
+    # single variable path
+    result = pb.spread_draws(idata, var_names="b", combined=False)
+    assert result["b"].null_count() == 3
+    assert not result["b"].is_nan().any()
+
+
+_extract_variables = {
+    "a": (("chain", "draw", "x"), np.arange(24.0).reshape(2, 3, 4)),
+    "b": (("chain", "draw"), np.arange(6.0).reshape(2, 3)),
+    "z": (("m", "chain", "draw"), np.arange(30.0).reshape(5, 2, 3)),
+    "w": (("q",), np.arange(2.0)),
+}
+
+
+@pytest.mark.parametrize(
+    "var_order", list(itertools.permutations(_extract_variables))
+)
+@pytest.mark.parametrize(
+    "extract_kwargs",
+    [
+        dict(num_samples=3, rng=1),
+        dict(num_samples=3, rng=0),
+        dict(num_samples=4, rng=False),
+        dict(num_samples=100, rng=2),
+        dict(num_samples=3, rng=1, var_names=["b", "a"]),
+        dict(combined=False),
+    ],
+)
+def test_extract_matches_az_extract(var_order, extract_kwargs):
+    """
+    When it does not skip stacking, _extract should return
+    exactly what az.extract does, including the order of the
+    dataset's dimensions and variables, which determines the
+    layout of spread_draws output.
+    """
+    idata = az.InferenceData(
+        posterior=xr.Dataset(
+            {k: _extract_variables[k] for k in var_order},
+            coords=dict(chain=[0, 1], draw=[0, 1, 2], x=[10, 20, 30, 40]),
+        )
+    )
+    expected = az.extract(idata, keep_dataset=True, **extract_kwargs)
+    result = _extract(idata, **extract_kwargs)
+    xr.testing.assert_identical(result, expected)
+    assert list(result.sizes) == list(expected.sizes)
+    assert list(result.variables) == list(expected.variables)
+
+
+def test_extract_generator_rng_matches_az_extract():
+    """
+    A np.random.Generator rng should draw the same samples
+    as az.extract with an identically seeded Generator.
+    """
+    idata = az.from_dict(
+        posterior={"a": np.arange(40.0).reshape(2, 20)},
+    )
+    expected = az.extract(
+        idata,
+        keep_dataset=True,
+        num_samples=5,
+        rng=np.random.default_rng(3),
+    )
+    result = _extract(idata, num_samples=5, rng=np.random.default_rng(3))
+    xr.testing.assert_identical(result, expected)
+    assert list(result.sizes) == list(expected.sizes)
+
+
+def test_enforce_drop_chain_draw_deprecated_no_op():
+    """
+    enforce_drop_chain_draw is still accepted, warns, and
+    already-combined input gets chain and draw as index
+    columns only.
+    """
+    rng = np.random.default_rng(5)
+    idata = az.from_dict(
+        posterior={
+            "a": rng.normal(size=(2, 10)),
+            "b": rng.normal(size=(2, 10, 3)),
+        }
+    )
+    with pytest.warns(DeprecationWarning, match="enforce_drop_chain_draw"):
+        result, index_cols = pb.spread_draws_and_get_index_cols(
+            az.extract(idata),
+            combined=False,
+            enforce_drop_chain_draw=True,
+        )
+    expected, expected_index_cols = pb.spread_draws_and_get_index_cols(idata)
+    assert index_cols == ("chain", "draw", "b_dim_0")
+    assert set(index_cols) == set(expected_index_cols)
+    assert result.columns == ["chain", "draw", "b_dim_0", "a", "b"]
+    assert result.sort(index_cols).equals(
+        expected.select(result.columns).sort(index_cols)
+    )